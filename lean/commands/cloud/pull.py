@@ -11,12 +11,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import click
 
 from lean.click import LeanCommand
 from lean.container import container
+from lean.models.errors import RequestFailedError
 
 
 @click.command(cls=LeanCommand)
@@ -38,12 +40,30 @@ def pull(project: Optional[str], pull_bootcamp: bool) -> None:
             pass
 
     api_client = container.api_client()
-    all_projects = api_client.projects.get_all()
-    project_manager = container.project_manager()
-    projects_to_pull = project_manager.get_projects_by_name_or_id(all_projects, project_id or project)
 
-    if project is None and not pull_bootcamp:
-        projects_to_pull = [p for p in projects_to_pull if not p.name.startswith("Boot Camp/")]
+    if project_id is not None:
+        # Retrieve the requested project while the list of all projects, which is needed for its libraries, loads
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            all_projects_future = executor.submit(api_client.projects.get_all)
+
+            try:
+                projects_to_pull = [api_client.projects.get(project_id)]
+            except RequestFailedError as error:
+                # The request may also fail for reasons unrelated to the project, so the original error is kept
+                raise RuntimeError(f"Could not retrieve project {project_id} from the cloud: {error}") from error
+
+            all_projects = all_projects_future.result()
+    else:
+        all_projects = api_client.projects.get_all()
+
+        # Boot Camp projects are only pulled when they are explicitly requested
+        if project is None and not pull_bootcamp:
+            candidates = [p for p in all_projects if not p.name.startswith("Boot Camp/")]
+        else:
+            candidates = all_projects
+
+        project_manager = container.project_manager()
+        projects_to_pull = project_manager.get_projects_by_name_or_id(candidates, project)
 
     pull_manager = container.pull_manager()
     pull_manager.pull_projects(projects_to_pull, all_projects)
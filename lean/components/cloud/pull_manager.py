@@ -12,16 +12,20 @@
 # limitations under the License.
 
 import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict
 
 from lean.components.api.api_client import APIClient
 from lean.components.config.project_config_manager import ProjectConfigManager
+from lean.components.util.environment import get_positive_int_from_environment
 from lean.components.util.library_manager import LibraryManager
 from lean.components.util.logger import Logger
 from lean.components.util.platform_manager import PlatformManager
 from lean.components.util.project_manager import ProjectManager
-from lean.models.api import QCProject, QCLeanEnvironment, QCLanguage
+from lean.constants import CLOUD_PULL_CONCURRENCY
+from lean.models.api import QCProject, QCLeanEnvironment, QCLanguage, QCFullFile
 from lean.models.utils import LeanLibraryReference
 
 
@@ -67,34 +71,61 @@ class PullManager:
         projects_not_pulled = []
         project_paths = {}
 
-        for index, project in enumerate(projects_to_pull, start=1):
+        # The files of upcoming projects are downloaded concurrently, they are written to disk one project at a time
+        # This keeps the local paths of projects with the same name deterministic
+        # At most `concurrency` downloads are queued at once so file contents don't pile up ahead of the writer
+        concurrency = get_positive_int_from_environment("LEAN_CLI_PULL_CONCURRENCY", CLOUD_PULL_CONCURRENCY)
+        downloads = deque()
+        next_download = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
             try:
-                self._logger.info(f"[{index}/{len(projects_to_pull)}] Pulling '{project.name}'")
-                project_paths[project.projectId] = self._pull_project(project, environments)
-            except Exception as ex:
-                projects_not_pulled.append(project)
-                self._logger.debug(traceback.format_exc().strip())
-                if self._last_file is not None:
-                    self._logger.warn(
-                        f"Cannot pull '{project.name}' (id {project.projectId}, failed on {self._last_file}): {ex}")
-                else:
-                    self._logger.warn(f"Cannot pull '{project.name}' (id {project.projectId}): {ex}")
+                for index, project in enumerate(projects_to_pull, start=1):
+                    while next_download < len(projects_to_pull) and len(downloads) < concurrency:
+                        downloads.append(executor.submit(self._api_client.files.get_all,
+                                                         projects_to_pull[next_download].projectId))
+                        next_download += 1
+
+                    download = downloads.popleft()
+
+                    try:
+                        self._logger.info(f"[{index}/{len(projects_to_pull)}] Pulling '{project.name}'")
+                        project_paths[project.projectId] = self._pull_project(project,
+                                                                              download.result(),
+                                                                              environments)
+                    except Exception as ex:
+                        projects_not_pulled.append(project)
+                        self._logger.debug(traceback.format_exc().strip())
+                        if self._last_file is not None:
+                            self._logger.warn(f"Cannot pull '{project.name}' "
+                                              f"(id {project.projectId}, failed on {self._last_file}): {ex}")
+                        else:
+                            self._logger.warn(f"Cannot pull '{project.name}' (id {project.projectId}): {ex}")
+            finally:
+                # Don't wait for queued downloads when pulling stops early, e.g. because of Ctrl+C
+                for download in downloads:
+                    download.cancel()
 
         projects_to_update = [project for project in projects_to_pull if project not in projects_not_pulled]
         self._update_local_library_references(projects_to_update, project_paths)
 
-    def _pull_project(self, project: QCProject, environments: List[QCLeanEnvironment]) -> Path:
+    def _pull_project(self,
+                      project: QCProject,
+                      cloud_files: List[QCFullFile],
+                      environments: List[QCLeanEnvironment]) -> Path:
         """Pulls a single project from the cloud to the local drive.
 
         Raises an error with a descriptive message if the project cannot be pulled.
 
         :param project: the cloud project to pull
+        :param cloud_files: the files of the cloud project
+        :param environments: the available Lean environments
         :return the actual local path of the project
         """
         local_project_path = self.get_local_project_path(project)
 
         # Pull the cloud files to the local drive
-        self._pull_files(project, local_project_path)
+        self._pull_files(project, cloud_files, local_project_path)
 
         # Update the local project config with the latest details
         project_config = self._project_config_manager.get_project_config(local_project_path)
@@ -117,16 +148,17 @@ class PullManager:
 
         return local_project_path
 
-    def _pull_files(self, project: QCProject, local_project_path: Path) -> None:
+    def _pull_files(self, project: QCProject, cloud_files: List[QCFullFile], local_project_path: Path) -> None:
         """Pull the files of a single project.
 
         :param project: the cloud project of which the files need to be pulled
+        :param cloud_files: the files of the cloud project
         :param local_project_path: the path to the local project directory
         """
         if not local_project_path.exists():
             self._project_manager.create_new_project(local_project_path, project.language)
 
-        for cloud_file in self._api_client.files.get_all(project.projectId):
+        for cloud_file in cloud_files:
             self._last_file = cloud_file.name
 
             if cloud_file.isLibrary:
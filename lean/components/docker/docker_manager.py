@@ -15,6 +15,7 @@ import hashlib
 import json
 import os
 import platform
+import re
 import shutil
 import signal
 import subprocess
@@ -22,25 +23,49 @@ import sys
 import threading
 import time
 import types
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Set, Any, Dict
+from typing import Optional, Set, Any, Dict, List
 from subprocess import Popen, PIPE
 import docker
-from dateutil.parser import isoparse
-from docker.errors import APIError
+from docker.errors import APIError, ImageNotFound, NotFound
 from docker.models.containers import Container
 from docker.types import Mount
+from rich.progress import Progress
 
+from lean.components.util.environment import get_positive_int_from_environment
 from lean.components.util.logger import Logger
 from lean.components.util.platform_manager import PlatformManager
 from lean.components.util.temp_manager import TempManager
 from lean.constants import SITE_PACKAGES_VOLUME_LIMIT, \
-    DOCKER_NETWORK, CUSTOM_FOUNDATION, CUSTOM_RESEARCH, CUSTOM_ENGINE
+    DOCKER_NETWORK, CUSTOM_FOUNDATION, CUSTOM_RESEARCH, CUSTOM_ENGINE, DOCKER_PULL_CONCURRENCY
 
 from lean.models.docker import DockerImage
 from lean.models.errors import MoreInfoError
 from lean.components.util.custom_json_encoder import DecimalEncoder
 
+# LEAN waits for a key press after printing one of these messages, run_image answers it when running in a terminal
+_EXIT_TRIGGERS = re.compile(rb"Press any key to exit\.\.\.|QuantConnect\.Report\.Main\(\): Completed\.")
+
+# Splits an RFC 3339 timestamp returned by the Docker API into the part before and after its fractional seconds
+_DOCKER_TIMESTAMP = re.compile(r"([^.]+)(?:\.\d+)?(.*)")
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parses a timestamp returned by the Docker API.
+
+    The fractional seconds are dropped, datetime.fromisoformat() only supports up to 6 digits before Python 3.11.
+
+    :param timestamp: the RFC 3339 timestamp to parse, like 2021-06-01T12:34:56.123456789Z
+    :return: the parsed timezone-aware datetime
+    """
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+
+    match = _DOCKER_TIMESTAMP.fullmatch(timestamp)
+    return datetime.fromisoformat(match.group(1) + match.group(2))
+
+
 class DockerManager:
     """The DockerManager contains methods to manage and run Docker images."""
 
@@ -55,26 +80,160 @@ class DockerManager:
         self._temp_manager = temp_manager
         self._platform_manager = platform_manager
 
+        self._docker_client = None
+        self._docker_client_lock = threading.Lock()
+
     def pull_image(self, image: DockerImage) -> None:
         """Pulls a Docker image.
 
         :param image: the image to pull
         """
-        if image.name == CUSTOM_RESEARCH or image.name == CUSTOM_ENGINE or image.name == CUSTOM_FOUNDATION:
-            self._logger.info(f"Skip pulling local image {image}...")
+        self.pull_images([image])
+
+    def pull_images(self, images: List[DockerImage]) -> None:
+        """Pulls multiple Docker images concurrently.
+
+        At most DOCKER_PULL_CONCURRENCY images are pulled at the same time,
+        this can be overridden using the LEAN_DOCKER_CONCURRENT_PULLS environment variable.
+
+        :param images: the images to pull
+        """
+        images_to_pull = []
+        for image in images:
+            if image.name == CUSTOM_RESEARCH or image.name == CUSTOM_ENGINE or image.name == CUSTOM_FOUNDATION:
+                self._logger.info(f"Skip pulling local image {image}...")
+            else:
+                images_to_pull.append(image)
+
+        if len(images_to_pull) == 0:
             return
 
-        self._logger.info(f"Pulling {image}...")
-        # We cannot really use docker_client.images.pull() here as it doesn't let us log the progress
-        # Downloading multiple gigabytes without showing progress does not provide good developer experience
+        for image in images_to_pull:
+            self._logger.info(f"Pulling {image}...")
+
+        # The low-level API streams the pull events, which lets us show the progress of every layer
+        # It reuses the cached DockerClient's connection instead of starting a docker CLI process per image
+        progress = self._logger.progress(prefix="{task.description}")
+        stop_event = threading.Event()
+        try:
+            if len(images_to_pull) == 1:
+                errors = [self._pull_image_with_progress(images_to_pull[0], progress, stop_event)]
+            else:
+                errors = self._pull_images_concurrently(images_to_pull, progress, stop_event)
+        except BaseException:
+            # Make the pulls that are still running stop reading their event streams, e.g. on Ctrl+C
+            stop_event.set()
+            raise
+        finally:
+            progress.stop()
+
+        # Fall back to the docker CLI for the images the API failed to pull
         # Since the pull command is the same on Windows, macOS and Linux we can safely use a system call
-        if shutil.which("docker") is not None:
-            process = subprocess.run(["docker", "image", "pull", str(image)])
-            if process.returncode != 0:
-                raise RuntimeError(
-                    f"Something went wrong while pulling {image}, see the logs above for more information")
-        else:
-            self._get_docker_client().images.pull(image.name, image.tag)
+        failed_images = []
+        for image, error in zip(images_to_pull, errors):
+            if error is None:
+                continue
+
+            self._logger.debug(f"Pulling {image} using the Docker API failed: {error}")
+
+            if shutil.which("docker") is None:
+                self._logger.error(error)
+            elif subprocess.run(["docker", "image", "pull", str(image)]).returncode == 0:
+                continue
+
+            failed_images.append(str(image))
+
+        if len(failed_images) > 0:
+            raise RuntimeError(
+                f"Something went wrong while pulling {', '.join(failed_images)}, see the logs above for more information")
+
+    def _pull_images_concurrently(self,
+                                  images: List[DockerImage],
+                                  progress: Progress,
+                                  stop_event: threading.Event) -> List[Optional[str]]:
+        """Pulls multiple Docker images on separate threads.
+
+        :param images: the images to pull
+        :param progress: the Progress instance to add the layer progress bars to
+        :param stop_event: the event which makes the pulls stop when it is set
+        :return: the results of _pull_image_with_progress() for the given images, in the same order
+        """
+        errors = [None] * len(images)
+        next_index = 0
+        next_index_lock = threading.Lock()
+
+        def pull_remaining_images() -> None:
+            nonlocal next_index
+            while not stop_event.is_set():
+                with next_index_lock:
+                    if next_index >= len(images):
+                        return
+                    index = next_index
+                    next_index += 1
+
+                errors[index] = self._pull_image_with_progress(images[index], progress, stop_event)
+
+        concurrency = get_positive_int_from_environment("LEAN_DOCKER_CONCURRENT_PULLS", DOCKER_PULL_CONCURRENCY)
+
+        # The threads are daemon threads so an interrupted pull doesn't keep the CLI alive until its download is done
+        threads = [threading.Thread(target=pull_remaining_images, daemon=True)
+                   for _ in range(min(concurrency, len(images)))]
+        for thread in threads:
+            thread.start()
+
+        # A blocking join cannot be interrupted by Ctrl+C on Windows, so we wake up periodically
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.1)
+
+        return errors
+
+    def _pull_image_with_progress(self,
+                                  image: DockerImage,
+                                  progress: Progress,
+                                  stop_event: threading.Event) -> Optional[str]:
+        """Pulls a Docker image using the Docker API and shows the download progress of each layer.
+
+        :param image: the image to pull
+        :param progress: the Progress instance to add the layer progress bars to
+        :param stop_event: the event which makes the pull stop reading its event stream when it is set
+        :return: None if the image was pulled successfully, the error message if not
+        """
+        layer_tasks = {}
+        layer_totals = {}
+
+        try:
+            docker_client = self._get_docker_client()
+            for event in docker_client.api.pull(image.name, tag=image.tag, stream=True, decode=True):
+                if stop_event.is_set():
+                    return "The pull was interrupted"
+
+                if "error" in event:
+                    return event["error"]
+
+                layer_id = event.get("id")
+                status = event.get("status", "")
+                if layer_id is None or status.startswith("Pulling from"):
+                    continue
+
+                if layer_id not in layer_tasks:
+                    layer_tasks[layer_id] = progress.add_task(f"{image} {layer_id}", total=1)
+                    layer_totals[layer_id] = 1
+
+                progress_detail = event.get("progressDetail") or {}
+                if status == "Downloading" and progress_detail.get("total"):
+                    layer_totals[layer_id] = progress_detail["total"]
+                    progress.update(layer_tasks[layer_id],
+                                    completed=progress_detail["current"],
+                                    total=layer_totals[layer_id])
+                elif status in ["Download complete", "Pull complete", "Already exists"]:
+                    progress.update(layer_tasks[layer_id], completed=layer_totals[layer_id])
+        except Exception as exception:
+            # The connection to the daemon may be broken, make later requests reconnect
+            self.reset()
+            return str(exception)
+
+        return None
 
     def run_image(self, image: DockerImage, **kwargs) -> bool:
         """Runs a Docker image. If the image is not available locally it will be pulled first.
@@ -82,7 +241,7 @@ class DockerManager:
         See https://docker-py.readthedocs.io/en/stable/containers.html for all the supported kwargs.
 
         If kwargs contains an "on_output" property, it is removed before passing it on to docker.containers.run
-        and the given lambda is ran whenever the Docker container prints anything.
+        and the given lambda is ran for every line the Docker container prints.
 
         If kwargs contains an "format_output" property, it is removed before passing it on to docker.containers.run
         and the given lambda is ran after the Docker container completes running.
@@ -211,15 +370,15 @@ class DockerManager:
         # container.logs() is blocking, we run it on a separate thread so the SIGINT handler works properly
         # If we run this code on the current thread, SIGINT won't be triggered on Windows when Ctrl+C is triggered
         def print_logs() -> None:
-            chunk_buffer = bytes()
+            chunk_buffer = bytearray()
             is_first_time = True
-            log_dump = ""
+            log_dump = []
 
             try:
                 while True:
                     container.reload()
                     if container.status != "running":
-                        return log_dump
+                        return "".join(log_dump)
 
                     if is_first_time:
                         tail = "all"
@@ -229,24 +388,30 @@ class DockerManager:
 
                     # Capture all logs and print it to stdout line by line
                     for chunk in container.logs(stream=True, follow=True, tail=tail):
-                        chunk_buffer += chunk
+                        chunk_buffer.extend(chunk)
 
-                        if not chunk_buffer.endswith(b"\n"):
+                        # Process all complete lines, an unterminated last line is kept until it is completed
+                        line_end = chunk_buffer.rfind(b"\n")
+                        if line_end < 0:
                             continue
 
-                        chunk = chunk_buffer.decode("utf-8")
-                        chunk_buffer = bytes()
+                        lines = chunk_buffer[:line_end + 1]
+                        del chunk_buffer[:line_end + 1]
+
+                        chunk = lines.decode("utf-8")
 
                         if on_output is not None:
-                            on_output(chunk)
+                            # The chunk always ends with a newline, splitlines() would also split on "\r" and others
+                            for line in chunk[:-1].split("\n"):
+                                on_output(line + "\n")
 
-                        log_dump = log_dump + chunk
+                        log_dump.append(chunk)
                         self._logger.info(chunk.rstrip())
 
                         if not is_tty:
                             continue
 
-                        if "Press any key to exit..." in chunk or "QuantConnect.Report.Main(): Completed." in chunk:
+                        if _EXIT_TRIGGERS.search(lines) is not None:
                             socket = docker_client.api.attach_socket(container.id, params={"stdin": 1, "stream": 1})
 
                             if hasattr(socket, "_sock"):
@@ -268,8 +433,13 @@ class DockerManager:
         logs_thread.daemon = True
         logs_thread.start()
 
-        while logs_thread.is_alive():
-            logs_thread.join(0.1)
+        # On POSIX systems a blocking join is interrupted by SIGINT, so the signal handler runs without polling
+        # On Windows a blocking join cannot be interrupted by Ctrl+C, so we wake up periodically to let it run
+        if self._platform_manager.is_system_windows():
+            while logs_thread.is_alive():
+                logs_thread.join(0.1)
+        else:
+            logs_thread.join()
 
         if killed:
             try:
@@ -309,8 +479,11 @@ class DockerManager:
         :param image: the image to check availability for
         :return: True if the image is available locally, False if not
         """
-        docker_client = self._get_docker_client()
-        return any(str(image) in x.tags for x in docker_client.images.list())
+        try:
+            self._get_docker_client().api.inspect_image(str(image))
+            return True
+        except ImageNotFound:
+            return False
 
     def get_local_digest(self, image: DockerImage) -> Optional[str]:
         """Returns the digest of a locally installed image.
@@ -318,9 +491,7 @@ class DockerManager:
         :param image: the local image to get the digest of
         :return: the digest of the local image, or None if the digest does not exist
         """
-        img = self._get_docker_client().images.get(str(image))
-
-        repo_digests = img.attrs["RepoDigests"]
+        repo_digests = self._get_docker_client().api.inspect_image(str(image))["RepoDigests"]
         if len(repo_digests) == 0:
             return None
 
@@ -341,7 +512,7 @@ class DockerManager:
         :param name: the name of then network to create
         """
         docker_client = self._get_docker_client()
-        if not any(n.name == name for n in docker_client.networks.list()):
+        if not any(n.name == name for n in docker_client.networks.list(names=[name])):
             docker_client.networks.create(name, driver="bridge")
 
     def create_volume(self, name: str) -> None:
@@ -349,9 +520,12 @@ class DockerManager:
 
         :param name: the name of the volume to create
         """
-        docker_client = self._get_docker_client()
-        if not any(v.name == name for v in docker_client.volumes.list()):
-            docker_client.volumes.create(name)
+        try:
+            self._get_docker_client().volumes.create(name)
+        except APIError as exception:
+            # 409 Conflict means the volume already exists
+            if exception.status_code != 409:
+                raise
 
     def create_site_packages_volume(self, requirements_file: Path) -> str:
         """Returns the name of the volume to mount to the user's site-packages directory.
@@ -362,16 +536,24 @@ class DockerManager:
         :param requirements_file: the path to the requirements file that will be pip installed in the container
         :return: the name of the Docker volume to use
         """
-        requirements_hash = hashlib.md5(requirements_file.read_text(encoding="utf-8").encode("utf-8")).hexdigest()
-        volume_name = f"lean_cli_python_{requirements_hash}"
+        requirements_hash = hashlib.sha256()
+        with requirements_file.open("rb") as file:
+            for block in iter(lambda: file.read(65536), b""):
+                requirements_hash.update(block)
+
+        volume_name = f"lean_cli_python_{requirements_hash.hexdigest()[:16]}"
 
         docker_client = self._get_docker_client()
-        existing_volumes = [v for v in docker_client.volumes.list() if v.name.startswith("lean_cli_python_")]
 
-        if any(v.name == volume_name for v in existing_volumes):
+        try:
+            docker_client.volumes.get(volume_name)
             return volume_name
+        except NotFound:
+            pass
 
-        volumes_by_age = sorted(existing_volumes, key=lambda v: isoparse(v.attrs["CreatedAt"]))
+        existing_volumes = [v for v in docker_client.volumes.list() if v.name.startswith("lean_cli_python_")]
+
+        volumes_by_age = sorted(existing_volumes, key=lambda v: _parse_timestamp(v.attrs["CreatedAt"]))
         for i in range((len(volumes_by_age) - SITE_PACKAGES_VOLUME_LIMIT) + 1):
             volumes_by_age[i].remove()
 
@@ -392,7 +574,8 @@ class DockerManager:
         :param container_name: the name of the container to find
         :return: the container with the given name, or None if it does not exist
         """
-        for container in self._get_docker_client().containers.list(all=True):
+        # The name filter matches substrings, so an exact comparison is still needed on the filtered containers
+        for container in self._get_docker_client().containers.list(all=True, filters={"name": container_name}):
             if container.name.lstrip("/") == container_name:
                 return container
 
@@ -501,28 +684,42 @@ class DockerManager:
         }
 
 
+    def reset(self) -> None:
+        """Drops the cached DockerClient so the next request creates and pings a new one."""
+        with self._docker_client_lock:
+            self._docker_client = None
+
     def _get_docker_client(self) -> docker.DockerClient:
-        """Creates a DockerClient instance.
+        """Returns a DockerClient instance.
 
+        The client is created and pinged once, after which the same instance is reused.
         Raises an error if Docker is not running.
 
         :return: a DockerClient instance which responds to requests
         """
-        error = MoreInfoError("Please make sure Docker is installed and running",
-                              "https://www.lean.io/docs/v2/lean-cli/key-concepts/troubleshooting#02-Common-Errors")
+        if self._docker_client is not None:
+            return self._docker_client
 
-        try:
-            docker_client = docker.from_env()
-        except Exception:
-            raise error
+        with self._docker_client_lock:
+            if self._docker_client is not None:
+                return self._docker_client
 
-        try:
-            if not docker_client.ping():
+            error = MoreInfoError("Please make sure Docker is installed and running",
+                                  "https://www.lean.io/docs/v2/lean-cli/key-concepts/troubleshooting#02-Common-Errors")
+
+            try:
+                docker_client = docker.from_env()
+            except Exception:
+                raise error
+
+            try:
+                if not docker_client.ping():
+                    raise error
+            except Exception:
                 raise error
-        except Exception:
-            raise error
 
-        return docker_client
+            self._docker_client = docker_client
+            return docker_client
 
     def _format_source_path(self, path: str) -> str:
         """Formats a source path so Docker knows what it refers to.
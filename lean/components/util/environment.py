@@ -0,0 +1,29 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+
+def get_positive_int_from_environment(name: str, default: int) -> int:
+    """Reads a positive integer from an environment variable.
+
+    :param name: the name of the environment variable to read
+    :param default: the value to return if the variable is not set or does not contain a positive integer
+    :return: the value of the environment variable if it is a positive integer, the default value if not
+    """
+    try:
+        value = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+    return value if value > 0 else default
@@ -72,6 +72,10 @@ DEFAULT_RESEARCH_IMAGE = "quantconnect/research:latest"
 # This constant defines how many site packages volumes get created before old ones are removed
 SITE_PACKAGES_VOLUME_LIMIT = 10
 
+# The maximum number of Docker images that are pulled at the same time
+# This can be overridden using the LEAN_DOCKER_CONCURRENT_PULLS environment variable
+DOCKER_PULL_CONCURRENCY = 4
+
 # The base url of the QuantConnect API
 # This url should end with a forward slash
 _qc_api = os.environ.get("QC_API", "")
@@ -82,6 +86,10 @@ elif _qc_api == "beta":
 else:
     API_BASE_URL = "https://www.quantconnect.com/api/v2/"
 
+# The maximum number of cloud projects whose files are downloaded at the same time by `lean cloud pull`
+# This can be overridden using the LEAN_CLI_PULL_CONCURRENCY environment variable
+CLOUD_PULL_CONCURRENCY = 8
+
 # The interval in hours at which the CLI checks for updates to itself
 UPDATE_CHECK_INTERVAL_CLI = 24
 
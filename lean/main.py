@@ -13,7 +13,6 @@
 
 import ctypes
 import os
-import platform
 import site
 import sys
 import time
@@ -45,12 +44,11 @@ def _ensure_win32_available() -> None:
     possible_paths = [Path(p) for p in possible_paths]
     possible_directories = set(p for p in possible_paths if p.is_dir())
 
-    for directory in possible_directories:
-        target_directory = directory / "pywin32_system32"
-        if not target_directory.is_dir():
-            continue
-
-        os.environ["PATH"] += ";" + str(target_directory)
+    # Add all pywin32_system32 directories to PATH at once instead of updating it for every candidate directory
+    target_directories = [str(directory / "pywin32_system32") for directory in possible_directories
+                          if (directory / "pywin32_system32").is_dir()]
+    if len(target_directories) > 0:
+        os.environ["PATH"] += ";" + ";".join(target_directories)
 
         if _is_win32_available():
             return
@@ -82,7 +80,7 @@ def _ensure_win32_available() -> None:
     print("python pywin32_postinstall.py -install")
 
 
-if platform.system() == "Windows":
+if sys.platform == "win32":
     _ensure_win32_available()
 
 import traceback
@@ -24,11 +24,16 @@ from joblib import Parallel, delayed
 from pydantic import validator
 
 from lean.click import DateParameter
+from lean.components.api.data_client import DataClient
 from lean.container import container
 from lean.models.api import QCDataVendor
 from lean.models.logger import Option
 from lean.models.pydantic import WrappedBaseModel
 
+# Matches the characters that start an escape, group or character class in a "latest" regex template
+# Everything before it is a literal path that can be used as the listing prefix
+_REGEX_SPECIAL_CHARACTERS = re.compile(r"[\\[\]()]")
+
 
 class OptionResult(WrappedBaseModel):
     """The OptionResult class represents an option's result with an internal value and a display-friendly label."""
@@ -394,8 +399,11 @@ class Product(WrappedBaseModel):
         prefixes = set(group.prefix for group in groups)
         prefixes_to_files = {}
 
+        # The api_client provider is a factory, resolve it once instead of creating a new client for every prefix
+        data_client = container.api_client().data
+
         parallel = Parallel(n_jobs=max(1, multiprocessing.cpu_count() - 1), backend="threading")
-        for prefix, files_with_prefix in parallel(delayed(self._list_files)(prefix) for prefix in prefixes):
+        for prefix, files_with_prefix in parallel(delayed(self._list_files)(data_client, prefix) for prefix in prefixes):
             prefixes_to_files[prefix] = files_with_prefix
 
         data_files = set()
@@ -414,21 +422,25 @@ class Product(WrappedBaseModel):
         else:
             raise RuntimeError(f"No eligible path templates found")
 
-        for template in path_to_use.templates.all:
-            has_start_end = any(isinstance(o, DatasetDateOption) and o.start_end for o in self.dataset.options)
-            start = variables.get("start", None)
-            end = variables.get("end", None)
+        has_start_end = any(isinstance(o, DatasetDateOption) and o.start_end for o in self.dataset.options)
+        start = variables.get("start", None)
+        end = variables.get("end", None)
 
+        for template in path_to_use.templates.all:
             possible_files = set()
 
             if has_start_end and start is not None and end is not None:
-                variables_to_use = {**variables}
+                # Only the date variables change between days, so everything else is rendered once up front
+                date_template = self._render_template(template, {key: value for key, value in variables.items()
+                                                                 if key not in ["date", "year", "month", "day"]})
                 for date in rrule(DAILY, dtstart=start, until=end):
-                    variables_to_use["date"] = date
-                    variables_to_use["year"] = date.strftime("%Y")
-                    variables_to_use["month"] = date.strftime("%m")
-                    variables_to_use["day"] = date.strftime("%d")
-                    possible_files.add(self._render_template(template, variables_to_use))
+                    formatted_date = date.strftime("%Y%m%d")
+                    possible_files.add(self._render_template(date_template, {
+                        "date": formatted_date,
+                        "year": formatted_date[:4],
+                        "month": formatted_date[4:6],
+                        "day": formatted_date[6:]
+                    }))
             else:
                 possible_files.add(self._render_template(template, variables))
 
@@ -439,19 +451,19 @@ class Product(WrappedBaseModel):
         for regex_template in path_to_use.templates.latest:
             rendered_regex = self._render_template(regex_template, variables)
 
-            prefix = re.split(r"[\\[\]()]", rendered_regex)[0]
+            prefix = _REGEX_SPECIAL_CHARACTERS.split(rendered_regex, maxsplit=1)[0]
             compiled_regex = re.compile(rendered_regex)
 
             groups.append(DataFileLatestGroup(prefix=prefix, regex=compiled_regex))
 
         return groups
 
-    def _list_files(self, prefix: str) -> Tuple[str, Optional[List[str]]]:
+    def _list_files(self, data_client: DataClient, prefix: str) -> Tuple[str, Optional[List[str]]]:
         if len(prefix.split("/")) < 3:
             # Cannot get cloud directory listing less than 3 levels deep
             return prefix, None
         else:
-            return prefix, container.api_client().data.list_files(prefix)
+            return prefix, data_client.list_files(prefix)
 
     def _get_common_prefix(self, values: List[str]) -> str:
         """Finds the common prefix in a list of strings.
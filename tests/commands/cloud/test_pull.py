@@ -18,6 +18,7 @@ from dependency_injector import providers
 
 from lean.commands import lean
 from lean.container import container
+from lean.models.errors import RequestFailedError
 from tests.test_helpers import create_api_project, create_fake_lean_cli_directory
 
 
@@ -78,6 +79,7 @@ def test_cloud_pull_pulls_project_by_id() -> None:
 
     api_client = mock.Mock()
     api_client.projects.get_all.return_value = cloud_projects
+    api_client.projects.get.return_value = cloud_projects[0]
     container.api_client.override(providers.Object(api_client))
 
     pull_manager = mock.Mock()
@@ -134,3 +136,26 @@ def test_cloud_pull_aborts_when_project_input_matches_no_cloud_projects() -> Non
     assert result.exit_code != 0
 
     pull_manager.pull_projects.assert_not_called()
+
+
+def test_cloud_pull_aborts_when_project_id_matches_no_cloud_projects() -> None:
+    create_fake_lean_cli_directory()
+
+    cloud_projects = [create_api_project(1, "Project 1"),
+                      create_api_project(2, "Project 2")]
+
+    api_client = mock.Mock()
+    api_client.projects.get_all.return_value = cloud_projects
+    api_client.projects.get.side_effect = RequestFailedError(mock.Mock(), "Project not found")
+    container.api_client.override(providers.Object(api_client))
+
+    pull_manager = mock.Mock()
+    container.pull_manager.override(providers.Object(pull_manager))
+
+    result = CliRunner().invoke(lean, ["cloud", "pull", "--project", "3"])
+
+    assert result.exit_code != 0
+    assert "Project not found" in str(result.exception)
+    assert isinstance(result.exception.__cause__, RequestFailedError)
+
+    pull_manager.pull_projects.assert_not_called()
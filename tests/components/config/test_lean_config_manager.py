@@ -16,7 +16,6 @@ from pathlib import Path
 from typing import Optional
 from unittest import mock
 
-import json5
 import pytest
 
 from lean.components.config.cli_config_manager import CLIConfigManager
@@ -26,7 +25,7 @@ from lean.components.config.storage import Storage
 from lean.components.util.xml_manager import XMLManager
 from lean.container import container
 from lean.models.utils import DebuggingMethod
-from tests.test_helpers import create_fake_lean_cli_directory
+from tests.test_helpers import create_fake_lean_cli_directory, parse_json_with_comments
 
 
 def _create_lean_config_manager(cli_config_manager: Optional[CLIConfigManager] = None) -> LeanConfigManager:
@@ -132,7 +131,7 @@ def test_set_properties_adds_property_when_not_part_of_config_yet() -> None:
 
     config = (Path.cwd() / "lean.json").read_text(encoding="utf-8")
 
-    assert json5.loads(config)["my-property"] == "my-value"
+    assert parse_json_with_comments(config)["my-property"] == "my-value"
     assert config.count("my-property") == 1
 
 
@@ -151,7 +150,7 @@ def test_set_properties_updates_property_when_part_of_config_already() -> None:
 
     config = (Path.cwd() / "lean.json").read_text(encoding="utf-8")
 
-    assert json5.loads(config)["my-property"] == "my-value"
+    assert parse_json_with_comments(config)["my-property"] == "my-value"
     assert config.count("my-property") == 1
 
 
@@ -0,0 +1,259 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import _thread
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+from unittest import mock
+
+import pytest
+
+from lean.components.docker.docker_manager import DockerManager, _parse_timestamp
+from lean.components.util.temp_manager import TempManager
+from lean.models.docker import DockerImage
+
+
+def _create_docker_manager(docker_client: mock.Mock) -> DockerManager:
+    logger = mock.Mock()
+    logger.debug_logging_enabled = False
+
+    docker_manager = DockerManager(logger, TempManager(), mock.Mock())
+    docker_manager._get_docker_client = mock.Mock(return_value=docker_client)
+
+    return docker_manager
+
+
+def test_pull_image_propagates_keyboard_interrupt_without_falling_back_to_docker_cli() -> None:
+    consumed_events = []
+
+    def pull(name: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        consumed_events.append("first")
+        yield {"status": "Pulling fs layer", "id": "layer"}
+        raise KeyboardInterrupt()
+
+    docker_client = mock.Mock()
+    docker_client.api.pull.side_effect = pull
+
+    docker_manager = _create_docker_manager(docker_client)
+
+    with mock.patch("subprocess.run") as run:
+        with pytest.raises(KeyboardInterrupt):
+            docker_manager.pull_image(DockerImage(name="quantconnect/lean", tag="latest"))
+
+    assert consumed_events == ["first"]
+    run.assert_not_called()
+    docker_manager._logger.progress.return_value.stop.assert_called_once()
+
+
+def test_pull_images_propagates_keyboard_interrupt_without_draining_the_event_streams() -> None:
+    release_streams = threading.Event()
+    drained_streams = []
+
+    def pull(name: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        yield {"status": "Pulling fs layer", "id": name}
+        release_streams.wait(5)
+        yield {"status": "Downloading", "id": name, "progressDetail": {"current": 1, "total": 2}}
+        drained_streams.append(name)
+        yield {"status": "Pull complete", "id": name}
+
+    docker_client = mock.Mock()
+    docker_client.api.pull.side_effect = pull
+
+    docker_manager = _create_docker_manager(docker_client)
+
+    interrupt_timer = threading.Timer(0.2, _thread.interrupt_main)
+    interrupt_timer.start()
+
+    start = time.time()
+    with mock.patch("subprocess.run") as run:
+        with pytest.raises(KeyboardInterrupt):
+            docker_manager.pull_images([DockerImage(name="quantconnect/lean", tag="latest"),
+                                        DockerImage(name="quantconnect/research", tag="latest")])
+
+    assert time.time() - start < 2
+
+    # The pulls stop reading their event streams at the next event once they are interrupted
+    release_streams.set()
+    time.sleep(0.5)
+
+    assert drained_streams == []
+    run.assert_not_called()
+    docker_manager._logger.progress.return_value.stop.assert_called_once()
+
+
+def test_pull_image_shows_progress_of_each_layer() -> None:
+    docker_client = mock.Mock()
+    docker_client.api.pull.return_value = iter([
+        {"status": "Pulling from quantconnect/lean", "id": "latest"},
+        {"status": "Pulling fs layer", "id": "a"},
+        {"status": "Already exists", "id": "b"},
+        {"status": "Downloading", "id": "a", "progressDetail": {"current": 5, "total": 10}},
+        {"status": "Download complete", "id": "a"},
+        {"status": "Digest: sha256:123"}
+    ])
+
+    docker_manager = _create_docker_manager(docker_client)
+    progress = docker_manager._logger.progress.return_value
+    progress.add_task.side_effect = ["task-a", "task-b"]
+
+    with mock.patch("subprocess.run") as run:
+        docker_manager.pull_image(DockerImage(name="quantconnect/lean", tag="latest"))
+
+    docker_client.api.pull.assert_called_once_with("quantconnect/lean", tag="latest", stream=True, decode=True)
+    progress.add_task.assert_has_calls([mock.call("quantconnect/lean:latest a", total=1),
+                                        mock.call("quantconnect/lean:latest b", total=1)])
+    assert progress.update.call_args_list == [mock.call("task-b", completed=1),
+                                              mock.call("task-a", completed=5, total=10),
+                                              mock.call("task-a", completed=10)]
+    run.assert_not_called()
+
+
+def test_pull_images_falls_back_to_docker_cli_only_for_images_the_api_failed_to_pull() -> None:
+    def pull(name: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        if name == "quantconnect/lean":
+            yield {"error": "manifest unknown"}
+        else:
+            yield {"status": "Pull complete", "id": "a"}
+
+    docker_client = mock.Mock()
+    docker_client.api.pull.side_effect = pull
+
+    docker_manager = _create_docker_manager(docker_client)
+
+    with mock.patch("shutil.which", return_value="/usr/bin/docker"), \
+            mock.patch("subprocess.run", return_value=mock.Mock(returncode=0)) as run:
+        docker_manager.pull_images([DockerImage(name="quantconnect/lean", tag="latest"),
+                                    DockerImage(name="quantconnect/research", tag="latest")])
+
+    run.assert_called_once_with(["docker", "image", "pull", "quantconnect/lean:latest"])
+
+
+def test_pull_images_raises_error_listing_every_image_that_failed_to_pull() -> None:
+    docker_client = mock.Mock()
+    docker_client.api.pull.side_effect = Exception("Connection aborted")
+
+    docker_manager = _create_docker_manager(docker_client)
+
+    with mock.patch("shutil.which", return_value="/usr/bin/docker"), \
+            mock.patch("subprocess.run", return_value=mock.Mock(returncode=1)) as run:
+        with pytest.raises(RuntimeError) as error:
+            docker_manager.pull_images([DockerImage(name="quantconnect/lean", tag="latest"),
+                                        DockerImage(name="quantconnect/research", tag="latest")])
+
+    assert "quantconnect/lean:latest, quantconnect/research:latest" in str(error.value)
+    assert run.call_count == 2
+
+
+def test_pull_images_resets_cached_docker_client_when_api_pull_fails() -> None:
+    docker_client = mock.Mock()
+    docker_client.api.pull.side_effect = Exception("Connection aborted")
+
+    docker_manager = _create_docker_manager(docker_client)
+    docker_manager._docker_client = docker_client
+
+    with mock.patch("shutil.which", return_value="/usr/bin/docker"), \
+            mock.patch("subprocess.run", return_value=mock.Mock(returncode=0)):
+        docker_manager.pull_images([DockerImage(name="quantconnect/lean", tag="latest")])
+
+    assert docker_manager._docker_client is None
+
+
+def test_pull_image_logs_api_error_when_docker_cli_is_not_available() -> None:
+    docker_client = mock.Mock()
+    docker_client.api.pull.return_value = iter([{"error": "manifest unknown"}])
+
+    docker_manager = _create_docker_manager(docker_client)
+
+    with mock.patch("shutil.which", return_value=None), mock.patch("subprocess.run") as run:
+        with pytest.raises(RuntimeError):
+            docker_manager.pull_image(DockerImage(name="quantconnect/lean", tag="latest"))
+
+    docker_manager._logger.error.assert_called_once_with("manifest unknown")
+    run.assert_not_called()
+
+
+def _run_image_with_logs(chunks: List[bytes], is_tty: bool) -> Dict[str, Any]:
+    statuses = iter(["running"])
+
+    container = mock.Mock()
+    container.reload.side_effect = lambda: setattr(container, "status", next(statuses, "exited"))
+    container.logs.return_value = iter(chunks)
+    container.attrs = {"State": {"ExitCode": 0}}
+
+    docker_client = mock.Mock()
+    docker_client.containers.run.return_value = container
+
+    docker_manager = _create_docker_manager(docker_client)
+    docker_manager.image_installed = mock.Mock(return_value=True)
+    docker_manager.create_network = mock.Mock()
+
+    on_output = mock.Mock()
+    format_output = mock.Mock()
+
+    with mock.patch("signal.signal"), mock.patch("sys.stdout.isatty", return_value=is_tty):
+        success = docker_manager.run_image(DockerImage(name="quantconnect/lean", tag="latest"),
+                                           on_output=on_output,
+                                           format_output=format_output)
+
+    return {
+        "success": success,
+        "on_output": on_output,
+        "format_output": format_output,
+        "docker_client": docker_client,
+        "container": container
+    }
+
+
+def test_run_image_passes_complete_lines_to_on_output() -> None:
+    result = _run_image_with_logs([b"a\nb", b"\r\n", b"50%\r100%\n", b"c\n"], False)
+
+    assert result["success"]
+    assert result["on_output"].call_args_list == [mock.call("a\n"),
+                                                  mock.call("b\r\n"),
+                                                  mock.call("50%\r100%\n"),
+                                                  mock.call("c\n")]
+    result["format_output"].assert_called_once_with("a\nb\r\n50%\r100%\nc\n")
+
+
+def test_run_image_answers_exit_prompt_inside_multi_line_chunk() -> None:
+    result = _run_image_with_logs([b"Algorithm completed\nPress any key to exit...\nbye\n"], True)
+
+    assert result["on_output"].call_args_list == [mock.call("Algorithm completed\n"),
+                                                  mock.call("Press any key to exit...\n"),
+                                                  mock.call("bye\n")]
+
+    docker_client = result["docker_client"]
+    docker_client.api.attach_socket.assert_called_once_with(result["container"].id,
+                                                            params={"stdin": 1, "stream": 1})
+    docker_client.api.attach_socket.return_value._sock.send.assert_called_once_with(b"\n")
+
+
+def test_run_image_does_not_answer_exit_prompt_when_not_running_in_terminal() -> None:
+    result = _run_image_with_logs([b"Press any key to exit...\n"], False)
+
+    result["docker_client"].api.attach_socket.assert_not_called()
+
+
+@pytest.mark.parametrize("timestamp,expected", [
+    ("2021-06-01T12:34:56.123456789Z", datetime(2021, 6, 1, 12, 34, 56, tzinfo=timezone.utc)),
+    ("2021-06-01T12:34:56Z", datetime(2021, 6, 1, 12, 34, 56, tzinfo=timezone.utc)),
+    ("2021-06-01T12:34:56+02:00", datetime(2021, 6, 1, 12, 34, 56, tzinfo=timezone(timedelta(hours=2)))),
+    ("2021-06-01T12:34:56.5-07:00", datetime(2021, 6, 1, 12, 34, 56, tzinfo=timezone(timedelta(hours=-7))))
+])
+def test_parse_timestamp_drops_fractional_seconds_and_keeps_offset(timestamp: str, expected: datetime) -> None:
+    parsed = _parse_timestamp(timestamp)
+
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
@@ -0,0 +1,37 @@
+# QUANTCONNECT.COM - Democratizing Finance, Empowering Individuals.
+# Lean CLI v1.0. Copyright 2021 QuantConnect Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional
+
+import pytest
+
+from lean.components.util.environment import get_positive_int_from_environment
+
+
+@pytest.mark.parametrize("value,expected", [(None, 4),
+                                            ("8", 8),
+                                            ("1", 1),
+                                            ("0", 4),
+                                            ("-2", 4),
+                                            ("", 4),
+                                            ("abc", 4),
+                                            ("1.5", 4)])
+def test_get_positive_int_from_environment_returns_positive_values_and_default_otherwise(value: Optional[str],
+                                                                                          expected: int,
+                                                                                          monkeypatch: pytest.MonkeyPatch) -> None:
+    if value is None:
+        monkeypatch.delenv("LEAN_TEST_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("LEAN_TEST_CONCURRENCY", value)
+
+    assert get_positive_int_from_environment("LEAN_TEST_CONCURRENCY", 4) == expected
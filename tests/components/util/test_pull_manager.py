@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import platform
 from pathlib import Path
 from typing import List, Any, Tuple
@@ -340,6 +341,24 @@ def test_pull_projects_updates_lean_config() -> None:
     project_config.set.assert_called_with("organization-id", "123")
 
 
+def test_pull_projects_only_downloads_files_of_upcoming_projects_and_stops_when_interrupted() -> None:
+    create_fake_lean_cli_directory()
+
+    cloud_projects = [create_api_project(i, f"Project {i}") for i in range(1, 11)]
+
+    api_client = mock.Mock()
+    api_client.files.get_all = mock.MagicMock(return_value=[])
+
+    pull_manager = _create_pull_manager(api_client, mock.Mock())
+    pull_manager._pull_project = mock.Mock(side_effect=KeyboardInterrupt)
+
+    with mock.patch.dict(os.environ, {"LEAN_CLI_PULL_CONCURRENCY": "2"}):
+        with pytest.raises(KeyboardInterrupt):
+            pull_manager.pull_projects(cloud_projects, cloud_projects)
+
+    assert api_client.files.get_all.call_count <= 2
+
+
 @pytest.mark.parametrize("test_platform, unsupported_character", [
     *[("windows", char) for char in ["\\", ":", "*", "?", '"', "<", ">", "|"]],
     ("macos", ":")
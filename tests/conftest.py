@@ -13,13 +13,18 @@
 
 import os
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
 import certifi
 import pytest
+from click.testing import CliRunner
+from dependency_injector import providers
 from pyfakefs.fake_filesystem import FakeFilesystem
 from responses import RequestsMock
 
 from lean.container import container
+from tests.test_helpers import create_fake_lean_cli_directory
 
 
 # conftest.py is ran by pytest before loading each testing module
@@ -68,3 +73,43 @@ def reset_container_overrides() -> None:
         provider.reset_override()
 
     container.reset_override()
+
+
+@pytest.fixture
+def mock_container(reset_container_overrides: None) -> SimpleNamespace:
+    """A pytest fixture which replaces the Docker-dependent components in the container with mocks.
+
+    The mocks are available as the docker_manager and lean_runner attributes of the fixture's value.
+    Depending on reset_container_overrides makes sure the overrides are applied after the previous ones are reset.
+    """
+    docker_manager = mock.Mock()
+    lean_runner = mock.Mock()
+
+    with container.docker_manager.override(providers.Object(docker_manager)), \
+            container.lean_runner.override(providers.Object(lean_runner)):
+        yield SimpleNamespace(docker_manager=docker_manager, lean_runner=lean_runner)
+
+
+@pytest.fixture
+def lean_cli(fake_filesystem: FakeFilesystem) -> Path:
+    """A pytest fixture which creates a fake Lean CLI directory in the current working directory.
+
+    See create_fake_lean_cli_directory() for the created projects and libraries.
+    """
+    create_fake_lean_cli_directory()
+    return Path.cwd()
+
+
+@pytest.fixture
+def lean_root(lean_cli: Path) -> Path:
+    """A pytest fixture which returns the root directory of the fake Lean CLI directory as found by the CLI."""
+    return container.lean_config_manager().get_cli_root_directory()
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """A pytest fixture which provides a CliRunner to invoke commands with.
+
+    CliRunner isolates the streams per invoke() call, so a single instance can be shared by all tests.
+    """
+    return CliRunner()
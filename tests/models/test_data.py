@@ -12,12 +12,16 @@
 # limitations under the License.
 import re
 from datetime import datetime
-from typing import List, Dict, Optional, Union, Set, Pattern
+from typing import List, Dict, Optional, Union, Set, Pattern, Any
+from unittest import mock
 
 import pytest
+from dependency_injector import providers
 
+from lean.container import container
 from lean.models.data import DatasetOneOfCondition, OptionResult, DatasetTextOption, DatasetTextOptionTransform, \
-    DatasetSelectOption, DatasetDateOption, DataFileAllGroup, DataFileLatestGroup
+    DatasetSelectOption, DatasetDateOption, DataFileAllGroup, DataFileLatestGroup, Dataset, DatasetPath, \
+    DatasetPathTemplates, Product
 
 
 @pytest.mark.parametrize("option,values,results,expected", [
@@ -221,3 +225,106 @@ def test_data_file_latest_group_get_valid_files_works_correctly(prefix: str,
     group = DataFileLatestGroup(prefix=prefix, regex=regex)
 
     assert group.get_valid_files(files_with_prefix) == expected_result
+
+
+def _create_product(all_templates: List[str],
+                    latest_templates: List[str],
+                    variables: Dict[str, Any],
+                    multiple_tickers: bool = False) -> Product:
+    dataset = Dataset(name="name",
+                      vendor="vendor",
+                      categories=[],
+                      options=[
+                          DatasetTextOption(id="ticker",
+                                            label="Ticker",
+                                            description="description",
+                                            transform=DatasetTextOptionTransform.Lowercase,
+                                            multiple=multiple_tickers),
+                          DatasetDateOption(id="start", label="Start", description="description", start_end=True),
+                          DatasetDateOption(id="end", label="End", description="description", start_end=True)
+                      ],
+                      paths=[DatasetPath(templates=DatasetPathTemplates(all=all_templates, latest=latest_templates))],
+                      requires_security_master=False)
+
+    return Product(dataset=dataset,
+                   option_results={key: OptionResult(value=value, label=str(value)) for key, value in variables.items()})
+
+
+def test_product_get_data_file_groups_renders_all_templates_for_every_day_between_start_and_end() -> None:
+    variables = {"ticker": "spy", "start": datetime(2021, 12, 30), "end": datetime(2022, 1, 2)}
+    product = _create_product(["equity/usa/minute/{ticker}/{date}_trade.zip",
+                               "equity/usa/{ticker}/{year}/{month}/{day}.zip"], [], variables)
+
+    groups = product._get_data_file_groups(variables)
+
+    assert len(groups) == 2
+
+    assert groups[0].prefix == "equity/usa/minute/spy/202"
+    assert groups[0].possible_files == {
+        "equity/usa/minute/spy/20211230_trade.zip",
+        "equity/usa/minute/spy/20211231_trade.zip",
+        "equity/usa/minute/spy/20220101_trade.zip",
+        "equity/usa/minute/spy/20220102_trade.zip"
+    }
+
+    assert groups[1].prefix == "equity/usa/spy/202"
+    assert groups[1].possible_files == {
+        "equity/usa/spy/2021/12/30.zip",
+        "equity/usa/spy/2021/12/31.zip",
+        "equity/usa/spy/2022/01/01.zip",
+        "equity/usa/spy/2022/01/02.zip"
+    }
+
+
+def test_product_get_data_file_groups_renders_all_templates_once_without_start_and_end() -> None:
+    variables = {"ticker": "spy"}
+    product = _create_product(["equity/usa/daily/{ticker}.zip"], [], variables)
+
+    groups = product._get_data_file_groups(variables)
+
+    assert len(groups) == 1
+    assert groups[0].prefix == "equity/usa/daily/spy.zip"
+    assert groups[0].possible_files == {"equity/usa/daily/spy.zip"}
+
+
+def test_product_get_data_file_groups_uses_literal_part_of_latest_templates_as_prefix() -> None:
+    variables = {"ticker": "spy"}
+    product = _create_product([], [r"equity/usa/map_files/{ticker}_(\d+)\.zip"], variables)
+
+    groups = product._get_data_file_groups(variables)
+
+    assert len(groups) == 1
+    assert groups[0].prefix == "equity/usa/map_files/spy_"
+    assert groups[0].regex.pattern == r"equity/usa/map_files/spy_(\d+)\.zip"
+
+
+@pytest.mark.parametrize("prefix,expected_files", [
+    ("equity/usa", None),
+    ("equity/usa/daily/", ["equity/usa/daily/spy.zip"])
+])
+def test_product_list_files_only_lists_prefixes_at_least_three_levels_deep(prefix: str,
+                                                                          expected_files: Optional[List[str]]) -> None:
+    data_client = mock.Mock()
+    data_client.list_files.return_value = ["equity/usa/daily/spy.zip"]
+
+    product = _create_product([], [], {})
+
+    assert product._list_files(data_client, prefix) == (prefix, expected_files)
+
+    if expected_files is None:
+        data_client.list_files.assert_not_called()
+    else:
+        data_client.list_files.assert_called_once_with(prefix)
+
+
+def test_product_get_data_files_lists_files_with_a_single_data_client() -> None:
+    api_client = mock.Mock()
+    api_client.data.list_files.return_value = ["equity/usa/daily/aapl.zip", "equity/usa/daily/spy.zip"]
+    api_client_provider = mock.Mock(return_value=api_client)
+    container.api_client.override(providers.Callable(api_client_provider))
+
+    product = _create_product(["equity/usa/daily/{ticker}.zip"], [], {"ticker": ["spy", "ibm"]}, multiple_tickers=True)
+
+    assert product.get_data_files() == ["equity/usa/daily/spy.zip"]
+
+    api_client_provider.assert_called_once()
@@ -12,9 +12,11 @@
 # limitations under the License.
 
 import json
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 
 from lean.commands.create_project import (DEFAULT_CSHARP_MAIN, DEFAULT_CSHARP_NOTEBOOK, DEFAULT_PYTHON_MAIN,
                                           DEFAULT_PYTHON_NOTEBOOK, LIBRARY_PYTHON_MAIN, LIBRARY_CSHARP_MAIN)
@@ -22,6 +24,9 @@ from lean.components.util.project_manager import ProjectManager
 from lean.models.api import QCLanguage, QCLiveResults, QCProject, QCFullOrganization, \
     QCOrganizationData, QCOrganizationCredit, QCNode, QCNodeList, QCNodePrice, QCLeanEnvironment
 
+# Matches lines which only contain a // comment, comments after values are not supported
+_FULL_LINE_COMMENT_RE = re.compile(r"^\s*//.*$", re.MULTILINE)
+
 
 def _get_python_project_files(path: Path) -> dict:
     return {
@@ -46,23 +51,23 @@ def _get_csharp_project_files(path: Path) -> dict:
     }
 
 
-def _get_fake_libraries() -> dict:
+def _get_fake_libraries(root: Path) -> dict:
     return {
-        (Path.cwd() / "Library" / "Python Library" / "main.py"):
+        (root / "Library" / "Python Library" / "main.py"):
             LIBRARY_PYTHON_MAIN.replace("$CLASS_NAME$", "PythonLibrary"),
-        (Path.cwd() / "Library" / "Python Library" / "research.ipynb"): DEFAULT_PYTHON_NOTEBOOK,
-        (Path.cwd() / "Library" / "Python Library" / "config.json"): json.dumps({
+        (root / "Library" / "Python Library" / "research.ipynb"): DEFAULT_PYTHON_NOTEBOOK,
+        (root / "Library" / "Python Library" / "config.json"): json.dumps({
             "algorithm-language": "Python",
             "parameters": {}
         }),
-        (Path.cwd() / "Library" / "CSharp Library" / "Main.cs"):
+        (root / "Library" / "CSharp Library" / "Main.cs"):
             LIBRARY_CSHARP_MAIN.replace("$CLASS_NAME$", "CSharpLibrary"),
-        (Path.cwd() / "Library" / "CSharp Library" / "research.ipynb"): DEFAULT_CSHARP_NOTEBOOK,
-        (Path.cwd() / "Library" / "CSharp Library" / "config.json"): json.dumps({
+        (root / "Library" / "CSharp Library" / "research.ipynb"): DEFAULT_CSHARP_NOTEBOOK,
+        (root / "Library" / "CSharp Library" / "config.json"): json.dumps({
             "algorithm-language": "CSharp",
             "parameters": {}
         }),
-        (Path.cwd() / "Library" / "CSharp Library" / "CSharp Library.csproj"):
+        (root / "Library" / "CSharp Library" / "CSharp Library.csproj"):
             ProjectManager.get_csproj_file_default_content()
     }
 
@@ -74,26 +79,48 @@ def _write_fake_directory(files: dict) -> None:
             file.write(content)
 
 
-def create_fake_lean_cli_directory() -> None:
-    """Creates a directory structure similar to the one created by `lean init` with a Python and a C# project,
-    and a Python and a C# library"""
-    (Path.cwd() / "data").mkdir()
+@lru_cache(maxsize=None)
+def _get_fake_lean_cli_directory_files() -> Dict[str, str]:
+    """Returns the relative paths and contents of the files in a fake Lean CLI directory.
+
+    The contents are rendered once per test session, only writing them to the filesystem is repeated for every test.
+    The paths are stored as strings because Path instances are bound to the filesystem active at their creation.
+    """
+    root = Path(".")
 
     files = {
-        (Path.cwd() / "lean.json"): """
+        (root / "lean.json"): """
 {
     // data-folder documentation
     "data-folder": "data"
 }
         """,
-        **_get_python_project_files(Path.cwd() / "Python Project"),
-        **_get_csharp_project_files(Path.cwd() / "CSharp Project"),
-        **_get_fake_libraries()
+        **_get_python_project_files(root / "Python Project"),
+        **_get_csharp_project_files(root / "CSharp Project"),
+        **_get_fake_libraries(root)
     }
 
+    return {str(path): content for path, content in files.items()}
+
+
+def create_fake_lean_cli_directory() -> None:
+    """Creates a directory structure similar to the one created by `lean init` with a Python and a C# project,
+    and a Python and a C# library"""
+    (Path.cwd() / "data").mkdir()
+
+    files = {Path.cwd() / path: content for path, content in _get_fake_lean_cli_directory_files().items()}
     _write_fake_directory(files)
 
 
+def parse_json_with_comments(text: str) -> Any:
+    """Parses JSON which may contain full-line // comments, like the Lean config files written by the CLI.
+
+    :param text: the JSON to parse
+    :return: the parsed JSON
+    """
+    return json.loads(_FULL_LINE_COMMENT_RE.sub("", text))
+
+
 def create_fake_lean_cli_directory_with_subdirectories(depth: int) -> None:
     """Creates a directory structure similar to the one created by `lean init` with a Python and a C# project,
     and a Python and a C# library"""
@@ -112,7 +139,7 @@ def create_fake_lean_cli_directory_with_subdirectories(depth: int) -> None:
         """,
         **_get_python_project_files(python_project_dir),
         **_get_csharp_project_files(csharp_project_dir),
-        **_get_fake_libraries()
+        **_get_fake_libraries(Path.cwd())
     }
 
     _write_fake_directory(files)